@@ -4,136 +4,290 @@ import json
 import yaml
 import re
 import csv
-from pathlib import Path
+import multiprocessing
 import sys
-from collections import defaultdict
+from collections import Counter
+import pickle_cache
+
+# use the libyaml-backed loader when available, it is much faster than the pure-python one
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# orjson parses/serializes much faster than the stdlib json module, fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# google-re2 gives linear-time matching on untrusted workflow strings, fall back to re
+try:
+    import re2 as secret_re
+except ImportError:
+    secret_re = re
 
 # output files
 actions_inventory_json = "processed/actions_inventory.json"
 actions_inventory_csv = "processed/actions_inventory.csv"
 actions_summary_json = "processed/actions_summary.json"
 
+# per-repo cache of extracted actions, stored next to the workflows file.
+# bump the version whenever the extracted entries change shape
+actions_cache_file = ".actions_cache.pkl"
+actions_cache_version = 2
+
+# inventory columns, in CSV order
+INVENTORY_FIELDS = (
+        "repository",
+        "workflow_file",
+        "workflow_path",
+        "job_name",
+        "step_name",
+        "action_name",
+        "action_version",
+        "full_reference",
+        "is_pinned",
+        "has_secrets",
+        "required_secrets",
+        "is_third_party",
+        "with_params"
+        )
+
+# name columns that repeat across repositories; the parent interns them as results arrive,
+# since strings interned in a pool worker lose their identity when pickled back
+INTERNED_FIELDS = frozenset(("repository", "workflow_file", "job_name", "action_name"))
+
+# characters allowed in a full commit SHA
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+# ${{ secrets.NAME }} references
+SECRET_PATTERN = secret_re.compile(r'\$\{\{\s*secrets\.([A-Za-z0-9_-]+)\s*\}\}')
+
 # proceed only if directory exists
 os.makedirs(os.path.dirname(actions_inventory_json), exist_ok=True)
 
-def extract_actions():
-    print("extracting actions from workflows...")
-
-    # path to raw workflow data
-    raw_data_dir = Path("data/raw")
-    
-    # store actions data
-    actions_data = []
-
-    # track stats
-    stats = {
+def load_json(path):
+    """read a JSON file, using orjson when available"""
+    # one read call per file; the pool workers already overlap this I/O with parsing
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_workflows(workflows_file):
+    """read a repository's collected workflows, returns (repo_name, workflows).
+    workflows.jsonl holds one workflow per line, each tagged with its repo;
+    workflows.json is the older single-document layout"""
+    if not workflows_file.endswith(".jsonl"):
+        repo_data = load_json(workflows_file)
+        return repo_data["name"], repo_data.get("workflows", [])
+
+    loads = orjson.loads if orjson else json.loads
+    with open(workflows_file, "rb") as f:
+        workflows = [loads(line) for line in f if line.strip()]
+    return (workflows[0]["repo"] if workflows else ""), workflows
+
+def dump_json(data, path):
+    """write data as indented JSON, using orjson when available.
+    the file is written atomically so a failed dump never leaves a truncated JSON behind"""
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        if orjson:
+            try:
+                with open(tmp_file, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                os.replace(tmp_file, path)
+                return
+            except orjson.JSONEncodeError:
+                # orjson rejects integers wider than 64 bits, the stdlib json module writes them fine
+                pass
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def new_stats():
+    """empty stats counters, shared by the per-repository workers and the final summary"""
+    return {
             "total_repositories": 0,
             "repos_with_workflows": 0,
             "total_workflows": 0,
             "total_actions": 0,
-            "unique_actions": set(),
-            "actions_usage_count": defaultdict(int),
+            "actions_usage_count": Counter(),
             "unpinned_actions": 0,
             "pinned_actions":0
             }
 
-    # list all repo directories
-    repo_dirs = list(raw_data_dir.glob("*"))
-    total_repos = len(repo_dirs)
+def merge_stats(stats, repo_stats):
+    """fold the stats of one repository into the running totals"""
+    for key, value in repo_stats.items():
+        if key == "actions_usage_count":
+            stats[key].update(value)
+        else:
+            stats[key] += value
 
-    # process each repo
-    for i, repo_dir in enumerate(repo_dirs):
-        print(f"processing repository {i+1}/{total_repos}: {repo_dir.name}...", end="\r")
-        workflows_file = repo_dir / "workflows.json"
-        if not workflows_file.exists():
-            continue
+def extract_actions():
+    print("extracting actions from workflows...")
 
-        try:
-            with open(workflows_file, "r") as f:
-                repo_data = json.load(f)
-
-            repo_name = repo_data["name"]
-            workflows = repo_data.get("workflows", [])
-
-            if not workflows:
-                continue
-
-            stats["total_repositories"] += 1
-            stats["repos_with_workflows"] += 1
-            stats["total_workflows"] += len(workflows)
-
-            for workflow in workflows:
-                try:
-                    workflow_name = workflow.get("name", "")
-                    workflow_path = workflow.get("path", "")
-                    workflow_content = workflow.get("content", "")
-
-                    # parse YAML
-                    workflow_yaml = yaml.safe_load(workflow_content)
-
-                    if not workflow_yaml:
-                        continue
-
-                    # extract actions from jobs
-                    if "jobs" in workflow_yaml:
-                        for job_name, job_config in workflow_yaml["jobs"].items():
-                            # check for job-level uses (reusable workflows)
-                            if "uses" in job_config:
-                                action_ref = job_config["uses"]
-                                process_action(actions_data, stats, repo_name, workflow_name, workflow_path, job_name, "job-level", action_ref, job_config)
-
-                            # process steps within job
-                            if "steps" in job_config:
-                                for step_idx, step in enumerate(job_config["steps"]):
-                                    if "uses" in step:
-                                        action_ref = step["uses"]
-                                        step_name = step.get("name", f"step-{step_idx+1}")
-                                        process_action(actions_data, stats, repo_name, workflow_name, workflow_path, job_name, step_name, action_ref, step)
-
-                except Exception as e:
-                    print(f"\nerror processing workflow {workflow_name} in {repo_name}: {e}")
-        except Exception as e:
-            print(f"\nerror processing repository {repo_dir.name}: {e}")
+    # path to raw workflow data
+    raw_data_dir = "data/raw"
+    
+    # store actions data, one list per inventory field
+    actions_cols = new_columns()
+
+    # track stats
+    stats = new_stats()
+
+    # list all repo directories (scandir entries carry their type, no extra stat per repo)
+    with os.scandir(raw_data_dir) as entries:
+        repo_dirs = [entry.path for entry in entries if entry.is_dir()]
+    total_repos = len(repo_dirs)
+
+    # process repos in parallel, each one is independent (file read + JSON + YAML parse)
+    workers = os.cpu_count() or 1
+    chunksize = max(1, total_repos // (workers * 4))
+    # csv rows are streamed out per repo as results arrive
+    with multiprocessing.Pool(workers) as pool, open(actions_inventory_csv, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(INVENTORY_FIELDS)
+        results = pool.imap(process_repository, repo_dirs, chunksize=chunksize)
+        for i, (repo_cols, repo_stats) in enumerate(results):
+            print(f"processing repository {i+1}/{total_repos}: {os.path.basename(repo_dirs[i])}...", end="\r")
+            writer.writerows(zip(*repo_cols.values()))
+            for field, column in repo_cols.items():
+                if field in INTERNED_FIELDS:
+                    column = map(intern_name, column)
+                actions_cols[field].extend(column)
+            merge_stats(stats, repo_stats)
 
     print("\nprocessing complete!")
 
-    # convert set of unique actions to list for JSON serialization
-    stats["unique_actions"] = list(stats["unique_actions"])
-    stats["top_actions"] = sorted(stats["actions_usage_count"].items(), key=lambda x: x[1], reverse=True)[:50]
+    # the usage counter's keys are the unique actions
+    stats["unique_actions"] = list(stats["actions_usage_count"])
+    stats["top_actions"] = stats["actions_usage_count"].most_common(50)
 
     # save results
-    with open(actions_inventory_json, "w") as f:
-        json.dump(actions_data, f, indent=2)
-
-    with open(actions_summary_json, "w") as f:
-        # convert defaultdict to regular dict for JSON serialization
-        action_usage = dict(stats["actions_usage_count"])
-        stats_json = {**stats, "actions_usage_count": action_usage}
-        json.dump(stats_json, f, indent=2)
-
-    # generate csv
-    with open(actions_inventory_csv, "w", newline="") as f:
-        fieldnames = actions_data[0].keys() if actions_data else []
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for action in actions_data:
-            writer.writerow(action)
-
-    return actions_data, stats
-
-def process_action(actions_data, stats, repo_name, workflow_name, workflow_path, job_name, step_name, action_ref, config):
+    dump_json(inventory_records(actions_cols), actions_inventory_json)
+
+    # convert Counter to regular dict for JSON serialization
+    action_usage = dict(stats["actions_usage_count"])
+    stats_json = {**stats, "actions_usage_count": action_usage}
+    dump_json(stats_json, actions_summary_json)
+
+    return actions_cols, stats
+
+def intern_name(value):
+    """intern a name so every entry shares one copy; job ids from YAML are not always strings"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def new_columns():
+    """empty column lists for action entries, keyed (and ordered) by INVENTORY_FIELDS"""
+    return {field: [] for field in INVENTORY_FIELDS}
+
+def inventory_records(actions_cols):
+    """rebuild the per-action dicts from the column lists, leaving out absent with_params"""
+    records = []
+    for row in zip(*actions_cols.values()):
+        record = dict(zip(INVENTORY_FIELDS, row))
+        if record["with_params"] is None:
+            del record["with_params"]
+        records.append(record)
+    return records
+
+def process_repository(repo_dir):
+    """extract the actions of a single repository, returns (actions_cols, stats)"""
+    for workflows_name in ("workflows.jsonl", "workflows.json"):
+        workflows_file = os.path.join(repo_dir, workflows_name)
+        try:
+            st = os.stat(workflows_file)
+            break
+        except FileNotFoundError:
+            pass
+    else:
+        return new_columns(), new_stats()
+
+    # reuse the last extraction while the workflows file is unchanged
+    cache_file = os.path.join(repo_dir, actions_cache_file)
+    cache_key = (actions_cache_version, workflows_name, st.st_mtime_ns, st.st_size)
+    result = pickle_cache.load(cache_file, cache_key)
+    if result is None:
+        result = extract_repository(repo_dir, workflows_file)
+        pickle_cache.save(cache_file, cache_key, result)
+    return result
+
+def extract_repository(repo_dir, workflows_file):
+    """parse a repository's workflows file and extract its actions, returns (actions_cols, stats)"""
+    actions_cols = new_columns()
+    stats = new_stats()
+
+    try:
+        repo_name, workflows = load_workflows(workflows_file)
+
+        if not workflows:
+            return actions_cols, stats
+
+        stats["total_repositories"] += 1
+        stats["repos_with_workflows"] += 1
+        stats["total_workflows"] += len(workflows)
+
+        for workflow in workflows:
+            try:
+                workflow_name = workflow.get("name", "")
+                workflow_path = workflow.get("path", "")
+                workflow_content = workflow.get("content", "")
+
+                # only 'uses' keys produce actions, skip the YAML parse for run-only workflows.
+                # match the bare word so quoted/flow-style keys are still parsed
+                if "uses" not in workflow_content:
+                    continue
+
+                # parse YAML
+                workflow_yaml = yaml.load(workflow_content, Loader=YamlLoader)
+
+                if not workflow_yaml:
+                    continue
+
+                # extract actions from jobs
+                for job_name, step_name, action_ref, config in iter_uses(workflow_yaml):
+                    process_action(actions_cols, stats, repo_name, workflow_name, workflow_path, job_name, step_name, action_ref, config)
+
+            except Exception as e:
+                print(f"\nerror processing workflow {workflow_name} in {repo_name}: {e}")
+    except Exception as e:
+        print(f"\nerror processing repository {os.path.basename(repo_dir)}: {e}")
+
+    return actions_cols, stats
+
+def iter_uses(workflow_yaml):
+    """yield (job_name, step_name, action_ref, config) for every 'uses' in a parsed workflow"""
+    for job_name, job_config in (workflow_yaml.get("jobs") or {}).items():
+        # job-level uses (reusable workflows)
+        action_ref = job_config.get("uses")
+        if action_ref:
+            yield job_name, "job-level", action_ref, job_config
+
+        # steps within job
+        for step_idx, step in enumerate(job_config.get("steps") or []):
+            action_ref = step.get("uses")
+            if action_ref:
+                yield job_name, step.get("name", f"step-{step_idx+1}"), action_ref, step
+
+def process_action(actions_cols, stats, repo_name, workflow_name, workflow_path, job_name, step_name, action_ref, config):
     
     # extract action name + version
     parts = action_ref.split('@')
     action_name = parts[0]
     action_version = parts[1] if len(parts) > 1 else "unspecified"
 
-    # pinned? (using SHA)
-    is_pinned = bool(re.match(r'^[0-9a-f]{40}$', action_version))
+    # pinned? (using SHA) - the length check rejects tags/branches without scanning them
+    is_pinned = len(action_version) == 40 and HEX_DIGITS.issuperset(action_version)
 
     # update stats
     stats["total_actions"] += 1
-    stats["unique_actions"].add(action_name)
     stats["actions_usage_count"][action_name] += 1
 
     if is_pinned:
@@ -141,44 +295,41 @@ def process_action(actions_data, stats, repo_name, workflow_name, workflow_path,
     else:
         stats["unpinned_actions"] += 1
 
-    # extract secrets usage
-    required_secrets = extract_secrets(config)
-
-    # create action entry
-    action_entry = {
-            "repository": repo_name,
-            "workflow_file": workflow_name,
-            "workflow_path": workflow_path,
-            "job_name": job_name,
-            "step_name": step_name,
-            "action_name": action_name,
-            "action_version": action_version,
-            "full_reference": action_ref,
-            "is_pinned": is_pinned,
-            "has_secrets": len(required_secrets) > 0,
-            "required_secrets": required_secrets,
-            "is_third_party": not (action_name.startswith("actions/") or action_name.startswith("github/")),
-            "with_params": config.get("with", {})
-            }
-    actions_data.append(action_entry)
-
-def extract_secrets(config):
-    """extract secrets used in the step/job configuration"""
+    # extract secrets usage + params
+    required_secrets, with_params = extract_config_info(config)
+
+    # append the entry to the column lists, values in INVENTORY_FIELDS order
+    action_entry = (
+            repo_name,
+            workflow_name,
+            workflow_path,
+            job_name,
+            step_name,
+            action_name,
+            action_version,
+            action_ref,
+            is_pinned,
+            len(required_secrets) > 0,
+            required_secrets,
+            not (action_name.startswith("actions/") or action_name.startswith("github/")),
+            with_params
+            )
+    for column, value in zip(actions_cols.values(), action_entry):
+        column.append(value)
+
+def extract_config_info(config):
+    """extract secrets used and the 'with' params of the step/job configuration in one pass, returns (secrets, with_params)"""
     required_secrets = []
 
-    # check 'with' params
-    if "with" in config:
-        for param, value in config["with"].items():
-            if isinstance(value, str) and "${{" in value and "secrets." in value:
-                secret_matches = re.findall(r'\$\{\{\s*secrets\.([A-Za-z0-9_-]+)\s*\}\}', value)
-                required_secrets.extend(secret_matches)
+    # check 'with' params (None when the step has none, the field is left out of the inventory)
+    with_params = config.get("with") or None
+    if with_params:
+        scan_params(with_params, required_secrets)
 
     # check 'env' params
-    if "env" in config:
-        for key, value in config["env"].items():
-            if isinstance(value, str) and "${{" in value and "secrets." in value:
-                secret_matches = re.findall(r'\$\{\{\s*secrets\.([A-Za-z0-9_-]+)\s*\}\}', value)
-                required_secrets.extend(secret_matches)
+    env = config.get("env")
+    if env:
+        scan_params(env, required_secrets)
 
     # check 'secrets' params for reusable workflows
     if "secrets" in config:
@@ -187,7 +338,17 @@ def extract_secrets(config):
         elif isinstance(config["secrets"], list):
             required_secrets.extend(config["secrets"])
 
-    return list(set(required_secrets)) # remove duplicates
+    # remove duplicates, keeping first-seen order so output is stable between runs
+    if len(required_secrets) > 1:
+        required_secrets = list(dict.fromkeys(required_secrets))
+
+    return required_secrets, with_params
+
+def scan_params(params, required_secrets):
+    """collect secret references from the string values of a 'with'/'env' mapping"""
+    for value in params.values():
+        if isinstance(value, str) and "secrets." in value and "${{" in value:
+            required_secrets.extend(SECRET_PATTERN.findall(value))
 
 def print_summary(stats):
     """print summary of extracted actions"""
@@ -201,7 +362,7 @@ def print_summary(stats):
     print(f"unpinned actions: {stats['unpinned_actions']} ({stats['unpinned_actions']/stats['total_actions']*100:.2f}%)")
 
     print("\ntop 10 most used actions:")
-    for action, count in sorted(stats["actions_usage_count"].items(), key=lambda x: x[1], reverse=True)[:10]:
+    for action, count in stats["top_actions"][:10]:
         print(f" - {action}: {count} uses")
 
     print(f"\ndetailed inventory saved to: {actions_inventory_json} and {actions_inventory_csv}")
@@ -209,7 +370,7 @@ def print_summary(stats):
 
 if __name__ == "__main__":
     # run extraction
-    actions_data, stats = extract_actions()
+    actions_cols, stats = extract_actions()
 
     # print summary
     print_summary(stats)
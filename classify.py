@@ -0,0 +1,192 @@
+"""risk classification for extracted actions, the hot path of report_generator.py
+
+kept free of I/O and fully annotated so it can be compiled with mypyc
+(`mypyc classify.py`); when no compiled extension is present the pure
+Python module is imported instead.
+"""
+from itertools import islice
+from typing import Any
+
+# risk classification patterns - all literal, lowercase substrings matched against lowercased fields
+HIGH_RISK_PATTERNS = [
+    "docker://",  
+    "run:",       
+    "setup-",     
+    "checkout@",  
+    "upload-",    
+    "download-",  
+    "deploy-",    
+    "aws-",       
+    "gcp-",       
+    "azure-",     
+    "terraform-", 
+    "kubernetes-",
+    "docker",     
+    "ssh-",       
+]
+
+# production indicators
+PRODUCTION_INDICATORS = [
+    'prod',
+    'release',
+    'deploy',
+    'publish',
+    'main',
+    'master',
+    'live',
+    'kubesealer',
+    'docker-publish',
+    'delivery'
+]
+
+# access patterns -> reason
+PRIVILEGED_PATTERNS = {
+    "docker": "container manipulation privileges",
+    "kube": "kubernetes api access",
+    "admin": "administrative access",
+    "root": "root/elevated permissions",
+    "privileged": "explicitly marked as privileged",
+    "sudo": "sudo/superuser execution"
+}
+
+FS_ACCESS_PATTERNS = {
+    "checkout": "source code access",
+    "upload": "file upload capabilities",
+    "download": "file download capabilities",
+    "artifact": "artifact manipulation",
+    "cache": "cache access",
+    "file": "file operations",
+    "path": "path manipulation",
+    "dir": "directory operations",
+    "directory": "directory operations"
+}
+
+NETWORK_PATTERNS = {
+    "http": "http requests",
+    "curl": "curl commands",
+    "wget": "wget downloads",
+    "api": "api access",
+    "request": "network requests",
+    "fetch": "data fetching",
+    "download": "download capability",
+    "deploy": "deployment (potentially remote)",
+    "publish": "publishing (potentially remote)"
+}
+
+# access classifications: (flag key, reasons key, patterns)
+ACCESS_CHECKS = (
+    ("privileged", "privileged_reasons", PRIVILEGED_PATTERNS),
+    ("file_system_access", "fs_access_reasons", FS_ACCESS_PATTERNS),
+    ("network_access", "network_access_reasons", NETWORK_PATTERNS),
+)
+
+# risk factor weights, in risk_factors() bit order
+RISK_FACTOR_WEIGHTS = (
+    30,  # unpinned actions are higher risk
+    25,  # actions requiring secrets are higher risk
+    15,  # matches a high-risk pattern
+    20,  # third-party vs. github-owned actions
+    10,  # actions in production workflows might be higher risk
+)
+
+# precomputed score for every combination of factors, capped at 100
+RISK_SCORES = [
+    min(sum(weight for bit, weight in enumerate(RISK_FACTOR_WEIGHTS) if mask >> bit & 1), 100)
+    for mask in range(1 << len(RISK_FACTOR_WEIGHTS))
+]
+
+# deprecation hints, matched as substrings of the lowercased action name
+DEPRECATED_SUBSTRINGS = ("deprecated", "legacy")
+
+def lowercase_fields(action: dict[str, Any]) -> dict[str, str]:
+    """lowercase every field the classifiers scan, once per action"""
+    job_name = action.get("job_name")
+    return {
+        "name": action["action_name"].lower(),
+        "ref": action["full_reference"].lower(),
+        "wf": action["workflow_file"].lower(),
+        "wp": action["workflow_path"].lower(),
+        "job": str(job_name).lower() if job_name else "",
+        "params": str(action.get("with_params", {})).lower()
+    }
+
+def risk_factors(action: dict[str, Any], lowered: dict[str, str]) -> int:
+    """bitmask of the risk factors that apply to an action, bit i weighs RISK_FACTOR_WEIGHTS[i]"""
+    name_l, ref_l = lowered["name"], lowered["ref"]
+    
+    return ((not action["is_pinned"])
+            | bool(action["has_secrets"]) << 1
+            | any(pattern in name_l or pattern in ref_l for pattern in HIGH_RISK_PATTERNS) << 2
+            | bool(action["is_third_party"]) << 3
+            | action["production_workflow"] << 4)
+
+def calculate_risk_score(action: dict[str, Any], lowered: dict[str, str]) -> int:
+    return RISK_SCORES[risk_factors(action, lowered)]
+
+def determine_access(action: dict[str, Any], lowered: dict[str, str]) -> None:
+    """flag privileged/file system/network access and record the matched reasons"""
+    name_l, params_l = lowered["name"], lowered["params"]
+    
+    for flag, reasons_key, patterns in ACCESS_CHECKS:
+        matched_reasons: list[str] = []
+        for pattern, reason in patterns.items():
+            if pattern in name_l or pattern in params_l:
+                matched_reasons.append(f"{reason} ({pattern})")
+        
+        if matched_reasons:
+            action[reasons_key] = matched_reasons
+        action[flag] = bool(matched_reasons)
+
+def determine_deprecated(lowered: dict[str, str]) -> bool:
+    name_l = lowered["name"]
+    return any(substring in name_l for substring in DEPRECATED_SUBSTRINGS)
+
+def classification_key(action: dict[str, Any]) -> tuple:
+    """every input the classifiers read; actions sharing a key classify identically"""
+    return (action["action_name"], action["full_reference"], repr(action.get("with_params")),
+            action["workflow_file"], action["workflow_path"], action.get("job_name"),
+            action["has_secrets"], action["is_pinned"], action["is_third_party"])
+
+def classify_actions(actions_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # the same action usually repeats across workflows, so classify each distinct one once
+    unique: dict[tuple, dict[str, Any]] = {}
+    for action in actions_data:
+        unique.setdefault(classification_key(action), action)
+    representatives = list(unique.values())
+    field_counts = [len(action) for action in representatives]
+    
+    for action in representatives:
+        # every classifier below reads from the same lowercased fields
+        lowered = lowercase_fields(action)
+        
+        # check if workflow name, path or job name (if available) suggests production
+        wf_l, wp_l, job_l = lowered["wf"], lowered["wp"], lowered["job"]
+        matched_patterns = [pattern for pattern in PRODUCTION_INDICATORS
+                            if pattern in wf_l or pattern in wp_l or pattern in job_l]
+        action["production_workflow"] = bool(matched_patterns)
+        action["production_indicators"] = matched_patterns
+        
+        # calculate risk score, which reuses the production flag above
+        action["risk_score"] = calculate_risk_score(action, lowered)
+        
+        # assign risk level
+        if action["risk_score"] >= 70:
+            action["risk_level"] = "High"
+        elif action["risk_score"] >= 40:
+            action["risk_level"] = "Medium"
+        else:
+            action["risk_level"] = "Low"
+        
+        # additional classifications
+        determine_access(action, lowered)
+        action["deprecated"] = determine_deprecated(lowered)
+    
+    # broadcast the fields added to each representative back to its duplicates
+    results = {
+        key: dict(islice(action.items(), count, None))
+        for (key, action), count in zip(unique.items(), field_counts)
+    }
+    for action in actions_data:
+        action.update(results[classification_key(action)])
+    
+    return actions_data
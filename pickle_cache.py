@@ -0,0 +1,29 @@
+"""keyed pickle caches, shared by action_extractor.py and report_generator.py
+
+a cache file holds the pickled key followed by the pickled value; the key
+is pickled separately so a stale cache is rejected without loading the value.
+"""
+import os
+import pickle
+
+def load(path, key):
+    """return the value cached at path if it was saved under key, else None"""
+    try:
+        with open(path, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except Exception:
+        # missing or unreadable cache, the caller recomputes the value
+        return None
+
+def save(path, key, value):
+    """write the cache atomically, a failed write only costs a recomputation next run"""
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+    except OSError as e:
+        print(f"warning: could not write cache {path}: {e}")
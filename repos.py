@@ -1,15 +1,60 @@
 import os
+import sys
+import json
 import requests
 from dotenv import load_dotenv
-load_dotenv()
-token = os.environ["GITHUB_TOKEN"];
-org = os.environ["GITHUB_ORG"];
-repos = [];
-url = f"https://api.github.com/orgs/{org}/repos?per_page=100";
-while url:
-    r = requests.get(url, headers={"Authorization": f"token {token}"});
-    repos.extend([repo["full_name"] for repo in r.json()]);
-    url = r.links["next"]["url"] if "next" in r.links else None;
-with open("repo_list.txt", "w") as f:
-    f.write("\n".join(repos))
 
+# cursor-paginated GraphQL listing, 100 repositories per page with their default branch
+graphql_url = "https://api.github.com/graphql"
+repos_query = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { nameWithOwner defaultBranchRef { name } }
+    }
+  }
+}
+"""
+
+def fetch_repos(session, org):
+    """every repository of org as {"name", "default_branch"}, following the GraphQL cursor"""
+    repos = []
+    cursor = None
+    while True:
+        r = session.post(graphql_url, json={"query": repos_query, "variables": {"org": org, "cursor": cursor}})
+        if not r.ok:
+            # e.g. a 401 from a bad token
+            print(f"error listing repositories of {org}: HTTP {r.status_code}")
+            sys.exit(1)
+        # errors such as RATE_LIMITED or an unknown org come back with a 200
+        body = r.json()
+        organization = (body.get("data") or {}).get("organization")
+        if body.get("errors") or organization is None:
+            messages = "; ".join(error.get("message", "unknown error") for error in body.get("errors") or [])
+            print(f"error listing repositories of {org}: {messages or f'organization {org} not found'}")
+            sys.exit(1)
+        page = organization["repositories"]
+        repos.extend({
+            "name": node["nameWithOwner"],
+            # empty repositories have no default branch
+            "default_branch": (node["defaultBranchRef"] or {}).get("name")
+        } for node in page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            return repos
+        cursor = page["pageInfo"]["endCursor"]
+
+def main():
+    load_dotenv()
+    token = os.environ["GITHUB_TOKEN"]
+    org = os.environ["GITHUB_ORG"]
+
+    session = requests.Session()
+    session.headers.update({"Authorization": f"token {token}"})
+    repos = fetch_repos(session, org)
+
+    with open("repos.json", "w") as f:
+        json.dump(repos, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,156 @@
 import os
 import json
 import requests
-import base64
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from dotenv import load_dotenv
 
-load_dotenv()
-token = os.environ["GITHUB_TOKEN"]
-headers = {"Authorization": f"token {token}"}
+# orjson serializes much faster than the stdlib json module, fall back to json
+try:
+    from orjson import dumps
+except ImportError:
+    def dumps(obj):
+        return json.dumps(obj).encode("utf-8")
 
-with open("repo_list.txt", "r") as f:
-    repos = [line.strip() for line in f]
+raw_data_dir = Path("data/raw")
 
-for repo in repos:
+# repositories are fetched concurrently over one keep-alive session
+max_workers = 16
+
+# every workflow file of a repository, contents included, in a single GraphQL request
+graphql_url = "https://api.github.com/graphql"
+workflows_query = """
+query($owner: String!, $name: String!, $expression: String!) {
+  repository(owner: $owner, name: $name) {
+    object(expression: $expression) {
+      ... on Tree {
+        entries { name path type object { ... on Blob { text isBinary isTruncated } } }
+      }
+    }
+  }
+}
+"""
+
+# the contents API returns the file body itself, rather than base64 inside JSON, with this media type
+raw_accept = {"Accept": "application/vnd.github.raw"}
+
+def load_etags(repo_dir):
+    """ETags saved by the last run, only usable while its workflows.jsonl is still there"""
+    try:
+        if (repo_dir / "workflows.jsonl").exists():
+            return json.loads((repo_dir / "etags.json").read_bytes())
+    except Exception:
+        pass
+    return {}
+
+def repo_path(repo):
+    """data/raw/<owner>_<name>, where the collected files of a repository go"""
+    return raw_data_dir / repo.replace("/", "_")
+
+def new_session(token):
+    """a requests session authenticated with token, pooled for max_workers threads"""
+    session = requests.Session()
+    session.headers.update({"Authorization": f"token {token}"})
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers))
+    return session
+
+def fetch_workflows(repo_info, session):
+    """fetch a repository's workflow files, returns (repo, repo_data, etags);
+    repo_data is None on any error or when the workflows are unchanged since the last run,
+    so nothing is written and a failed fetch is retried next time"""
+    repo = repo_info["name"]
+    branch = repo_info["default_branch"]
     print(f"processing {repo}...")
     repo_data = {"name": repo, "workflows": []}
 
-    # get workflow files from .github/workflows
-    url = f"https://api.github.com/repos/{repo}/contents/.github/workflows"
     try:
-        r = requests.get(url, headers=headers)
-        if r.status_code == 200:
-            files = r.json()
-            for file in files:
-                if file["type"] == "file" and (file["name"].endswith(".yml") or file["name"].endswith(".yaml")):
-                    content_r = requests.get(file["url"], headers=headers)
-                    if content_r.status_code == 200:
-                        content = base64.b64decode(content_r.json()["content"]).decode("utf-8")
-                        repo_data["workflows"].append({
-                            "name": file["name"],
-                            "path": file["path"],
-                            "content": content
-                            })
-        # save data
-        os.makedirs(f"data/raw/{repo.replace('/', '_')}", exist_ok=True)
-        with open(f"data/raw/{repo.replace('/', '_')}/workflows.json", "w") as out_f:
-                  json.dump(repo_data, out_f, indent=2)
+        # the directory listing carries every file's sha, so its ETag changes with any workflow.
+        # a 304 answer is free against the rate limit and means the saved workflows are current
+        etags = load_etags(repo_path(repo))
+        listing_url = f"https://api.github.com/repos/{repo}/contents/.github/workflows"
+        conditional = {"If-None-Match": etags["listing"]} if "listing" in etags else {}
+        listing_r = session.get(listing_url, params={"ref": branch} if branch else None, headers=conditional)
+        if listing_r.status_code == 304:
+            print(f"{repo} unchanged, keeping saved workflows")
+            return repo, None, etags
+        if listing_r.status_code == 404:
+            # no workflows directory, the GraphQL query below could only come back null
+            return repo, repo_data, {}
+        # only returned, and so saved, once every workflow below has been fetched;
+        # an ETag from an error response must never vouch for the saved data
+        etags = {}
+        if listing_r.status_code == 200 and "ETag" in listing_r.headers:
+            etags["listing"] = listing_r.headers["ETag"]
+
+        # get workflow files from .github/workflows on the default branch
+        owner, name = repo.split("/", 1)
+        expression = f"{branch or 'HEAD'}:.github/workflows"
+        variables = {"owner": owner, "name": name, "expression": expression}
+        r = session.post(graphql_url, json={"query": workflows_query, "variables": variables})
+        if r.status_code != 200:
+            print(f"error processing {repo}: GraphQL request failed with status {r.status_code}")
+            return repo, None, {}
+        # errors such as RATE_LIMITED come back with a 200, never mistake them for an empty repository
+        body = r.json()
+        if body.get("errors") or body.get("data") is None:
+            messages = "; ".join(error.get("message", "unknown error") for error in body.get("errors") or [])
+            print(f"error processing {repo}: {messages or 'GraphQL response has no data'}")
+            return repo, None, {}
+
+        # a missing workflows directory comes back as null
+        repository = body["data"].get("repository") or {}
+        tree = repository.get("object") or {}
+        for entry in tree.get("entries", []):
+            blob = entry["object"] or {}
+            if (entry["type"] != "blob" or blob.get("isBinary")
+                    or not (entry["name"].endswith(".yml") or entry["name"].endswith(".yaml"))):
+                continue
+            content = blob.get("text")
+            if content is None or blob.get("isTruncated"):
+                # GraphQL omits or cuts off large blobs, fetch those as raw bytes instead of base64 JSON
+                content_r = session.get(f"https://api.github.com/repos/{repo}/contents/{entry['path']}",
+                                        params={"ref": branch} if branch else None, headers=raw_accept)
+                if content_r.status_code != 200:
+                    # saving the other files would let the listing ETag vouch for an incomplete set
+                    print(f"error processing {repo}: fetching {entry['path']} failed with status {content_r.status_code}")
+                    return repo, None, {}
+                content = content_r.content.decode("utf-8")
+            repo_data["workflows"].append({
+                "name": entry["name"],
+                "path": entry["path"],
+                "content": content
+                })
     except Exception as e:
-                  print(f"error processing {repo}: {e}")
+        print(f"error processing {repo}: {e}")
+        return repo, None, {}
+    return repo, repo_data, etags
+
+def dump_workflows(repo_data, path):
+    """write one JSON line per workflow, tagged with its repository"""
+    repo = repo_data["name"]
+    path.write_bytes(b"".join(dumps({"repo": repo, **workflow}) + b"\n" for workflow in repo_data["workflows"]))
+
+def main():
+    load_dotenv()
+    session = new_session(os.environ["GITHUB_TOKEN"])
+
+    # repositories and their default branches, as listed by repos.py
+    with open("repos.json", "r") as f:
+        repos = json.load(f)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for repo, repo_data, etags in executor.map(partial(fetch_workflows, session=session), repos):
+            if repo_data is None:
+                continue
+            # save data, then the ETags that vouch for it
+            repo_dir = repo_path(repo)
+            try:
+                repo_dir.mkdir(parents=True, exist_ok=True)
+                dump_workflows(repo_data, repo_dir / "workflows.jsonl")
+                (repo_dir / "etags.json").write_bytes(dumps(etags))
+            except Exception as e:
+                print(f"error processing {repo}: {e}")
 
+if __name__ == "__main__":
+    main()